@@ -21,20 +21,48 @@
 #
 # Licensed under the MIT License.
 # ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import functools
 import math
 import os
 import platform
 import random
+import select
+import shutil
 import subprocess
-import sys
+import threading
 import time
+from dataclasses import dataclass
 from typing import List
+from typing import Optional
+from typing import Tuple
 
-from distutils import spawn
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 __version__ = "1.5.3"
 
+# Default sampling interval (in milliseconds) of the persistent `nvidia-smi`
+# child process feeding `getGPUs`.
+_SMI_STREAM_INTERVAL_MS: int = 1000
+
+# Fields (effectively) immutable for the process lifetime, queried once and
+# cached by uuid
+_SMI_STATIC_QUERY: str = "--query-gpu=uuid,memory.total,driver_version,name,gpu_serial,display_active,display_mode,vbios_version,power.limit,compute_mode,pci.bus"
+
+# Volatile fields re-queried on every poll; `uuid` is the join key into the
+# static cache. The shorter the query, the less NVML work nvidia-smi does
+# per sample and the less CSV there is to parse.
+_SMI_DYNAMIC_QUERY: str = "--query-gpu=index,uuid,utilization.gpu,memory.used,memory.free,temperature.gpu,clocks.current.graphics,clocks.current.memory,power.draw"
+
 
 class GPU:
     __slots__ = [
@@ -103,8 +131,17 @@ class GPU:
         self.compute_mode = compute_mode
         self.pci_bus = pci_bus
 
-    def __str__(self):
-        return str(self.__dict__)
+    def __repr__(self):
+        # Slotted classes have no `__dict__` to stringify; walk `__slots__`
+        # directly instead of materializing a throwaway dict per call
+        return (
+            type(self).__name__
+            + "("
+            + ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+            + ")"
+        )
+
+    __str__ = __repr__
 
 
 class GPUProcess:
@@ -131,11 +168,116 @@ class GPUProcess:
         self.uid = uid
         self.uname = uname
 
-    def __str__(self):
-        return str(self.__dict__)
+    def __repr__(self):
+        return (
+            type(self).__name__
+            + "("
+            + ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+            + ")"
+        )
+
+    __str__ = __repr__
+
+
+@dataclass
+class GPUTable:
+    """Columnar (structure-of-arrays) view of a `getGPUs` snapshot.
+
+    One contiguous NumPy array per attribute instead of one `GPU` object per
+    device, so attribute-wise scans (availability filtering, ranking) run as
+    array sweeps rather than per-object pointer chasing. Requires numpy.
+    """
 
+    id: "np.ndarray"
+    uuid: "np.ndarray"
+    load: "np.ndarray"
+    memoryUtil: "np.ndarray"
+    memoryTotal: "np.ndarray"
+    memoryUsed: "np.ndarray"
+    memoryFree: "np.ndarray"
+    driver: "np.ndarray"
+    name: "np.ndarray"
+    serial: "np.ndarray"
+    display_mode: "np.ndarray"
+    display_active: "np.ndarray"
+    temperature: "np.ndarray"
+    vbios_version: "np.ndarray"
+    power_draw: "np.ndarray"
+    power_limit: "np.ndarray"
+    core_clock: "np.ndarray"
+    memory_clock: "np.ndarray"
+    compute_mode: "np.ndarray"
+    pci_bus: "np.ndarray"
 
-def safeFloatCast(strNumber: str) -> float:
+    @classmethod
+    def from_gpus(cls, GPUs: List["GPU"]) -> "GPUTable":
+        def _col(attr, dtype):
+            return np.array([getattr(gpu, attr) for gpu in GPUs], dtype=dtype)
+
+        return cls(
+            id=_col("id", np.int32),
+            uuid=_col("uuid", object),
+            load=_col("load", np.float32),
+            memoryUtil=_col("memoryUtil", np.float32),
+            memoryTotal=_col("memoryTotal", np.float32),
+            memoryUsed=_col("memoryUsed", np.float32),
+            memoryFree=_col("memoryFree", np.float32),
+            driver=_col("driver", object),
+            name=_col("name", object),
+            serial=_col("serial", object),
+            display_mode=_col("display_mode", object),
+            display_active=_col("display_active", object),
+            temperature=_col("temperature", np.float32),
+            vbios_version=_col("vbios_version", object),
+            power_draw=_col("power_draw", np.float32),
+            power_limit=_col("power_limit", np.float32),
+            core_clock=_col("core_clock", np.int32),
+            memory_clock=_col("memory_clock", np.int32),
+            compute_mode=_col("compute_mode", object),
+            pci_bus=_col("pci_bus", np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def to_objects(self) -> List["GPU"]:
+        # Thin row-wise view for consumers expecting `GPU` objects
+        return [
+            GPU(
+                int(self.id[g]),
+                self.uuid[g],
+                float(self.load[g]),
+                float(self.memoryTotal[g]),
+                float(self.memoryUsed[g]),
+                float(self.memoryFree[g]),
+                self.driver[g],
+                self.name[g],
+                self.serial[g],
+                self.display_mode[g],
+                self.display_active[g],
+                float(self.temperature[g]),
+                int(self.core_clock[g]),
+                int(self.memory_clock[g]),
+                self.vbios_version[g],
+                float(self.power_draw[g]),
+                float(self.power_limit[g]),
+                self.compute_mode[g],
+                int(self.pci_bus[g]),
+            )
+            for g in range(len(self))
+        ]
+
+
+def getGPUsTable(interval_ms: int = _SMI_STREAM_INTERVAL_MS) -> GPUTable:
+    """Like `getGPUs`, but returning a columnar `GPUTable` snapshot."""
+    if np is None:
+        raise RuntimeError("GPUTable requires numpy to be installed.")
+    return GPUTable.from_gpus(getGPUs(interval_ms))
+
+
+def safeFloatCast(strNumber) -> float:
+    # `float` accepts ASCII `bytes` as well as `str`, so raw nvidia-smi
+    # tokens can be cast without an intermediate decode
     try:
         number = float(strNumber)
     except ValueError:
@@ -143,68 +285,335 @@ def safeFloatCast(strNumber: str) -> float:
     return number
 
 
-def getNvidiaSmiCmd() -> str:
-    if platform.system() == "Windows":
-        # If the platform is Windows and nvidia-smi
-        # could not be found from the environment path,
-        # try to find it from system drive with default installation path
-        nvidia_smi = spawn.find_executable("nvidia-smi")
-        if nvidia_smi is None:
+# NVML device handles, cached once at import when `pynvml` is importable and
+# the driver initializes; `None` means "use the nvidia-smi subprocess path"
+_nvmlHandles = None
+if pynvml is not None:
+    try:
+        pynvml.nvmlInit()
+        _nvmlHandles = [
+            pynvml.nvmlDeviceGetHandleByIndex(i)
+            for i in range(pynvml.nvmlDeviceGetCount())
+        ]
+    except:
+        _nvmlHandles = None
+
+# NVML reports the compute mode as an enum; nvidia-smi prints it as a string
+_NVML_COMPUTE_MODES = {
+    0: "Default",
+    1: "Exclusive_Thread",
+    2: "Prohibited",
+    3: "Exclusive_Process",
+}
+
+
+def _nvmlStr(value) -> str:
+    # Older pynvml releases return `bytes` for string-valued queries
+    return value.decode("utf8") if isinstance(value, bytes) else value
+
+
+def _nvmlTry(func, *args, default=float("nan")):
+    # Some queries (serial, power, clocks, ...) are unsupported on some boards
+    try:
+        return func(*args)
+    except pynvml.NVMLError:
+        return default
+
+
+def _findNvidiaSmi() -> str:
+    nvidia_smi = shutil.which("nvidia-smi")
+    if nvidia_smi is None:
+        if platform.system() == "Windows":
+            # If the platform is Windows and nvidia-smi
+            # could not be found from the environment path,
+            # try to find it from system drive with default installation path
             nvidia_smi = (
                 "%s\\Program Files\\NVIDIA Corporation\\NVSMI\\nvidia-smi.exe"
                 % os.environ["systemdrive"]
             )
-    else:
-        nvidia_smi = "nvidia-smi"
+        else:
+            nvidia_smi = "nvidia-smi"
     return nvidia_smi
 
 
-def getGPUs() -> List[GPU]:
-    # Get ID, processing and memory utilization for all GPUs
-    nvidia_smi = getNvidiaSmiCmd()
-    try:
-        p = subprocess.run(
+# Resolved once at import: `shutil.which` walks PATH, which is too expensive
+# to repeat on every poll (and `distutils.spawn` is gone in Python 3.12+)
+_NVIDIA_SMI: str = _findNvidiaSmi()
+
+
+def getNvidiaSmiCmd() -> str:
+    return _NVIDIA_SMI
+
+
+class _SmiStream:
+    """Persistent `nvidia-smi -lms` child process shared by all `getGPUs` calls.
+
+    Spawning `nvidia-smi` anew on every poll pays the full fork+exec+driver
+    initialization cost per call. Keeping a single child alive with
+    `-lms <interval>` amortizes that cost across all samples: each call to
+    `read_frame` only consumes one block of CSV rows from the child's stdout.
+    """
+
+    _instance: Optional["_SmiStream"] = None
+
+    # Serializes spawn, frame reads and teardown: concurrent `getGPUs` calls
+    # (e.g. the overlapped tasks in `getGPUsAndProcesses`) must not race the
+    # singleton check into spawning two children, nor interleave `readline`
+    # on the shared pipe and split one frame's rows between threads
+    _lock = threading.RLock()
+
+    def __init__(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        # Unbuffered: with a buffered reader, rows pulled into userspace are
+        # invisible to `select`, which would misreport what is still pending
+        self.process = subprocess.Popen(
             [
-                nvidia_smi,
-                "--query-gpu=index,uuid,utilization.gpu,memory.total,memory.used,memory.free,driver_version,name,gpu_serial,display_active,display_mode,temperature.gpu,clocks.current.graphics,clocks.current.memory,vbios_version,power.draw,power.limit,compute_mode,pci.bus",
+                getNvidiaSmiCmd(),
+                _SMI_DYNAMIC_QUERY,
                 "--format=csv,noheader,nounits",
+                "-lms",
+                str(interval_ms),
             ],
             stdout=subprocess.PIPE,
-            encoding="utf8",
+            bufsize=0,
         )
-        stdout, stderror = p.stdout, p.stderr
+
+    @classmethod
+    def instance(cls, interval_ms: int = _SMI_STREAM_INTERVAL_MS) -> "_SmiStream":
+        # (Re)spawn the child if it was never started, was closed, died, or
+        # a different sampling interval is requested
+        with cls._lock:
+            if (
+                cls._instance is None
+                or cls._instance.process.poll() is not None
+                or cls._instance.interval_ms != interval_ms
+            ):
+                cls.close()
+                cls._instance = cls(interval_ms)
+            return cls._instance
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            if cls._instance is not None:
+                try:
+                    cls._instance.process.terminate()
+                    cls._instance.process.wait()
+                except:
+                    pass
+                cls._instance = None
+
+    def _readable(self, timeout: float) -> bool:
+        # `select` works on pipes on POSIX only; elsewhere report nothing
+        # pending, which merely disables the stale-frame drain below
+        try:
+            return bool(select.select([self.process.stdout], [], [], timeout)[0])
+        except (OSError, ValueError):
+            return False
+
+    def read_frame(self, numDevices: int) -> List[bytes]:
+        """Read one block of `numDevices` CSV rows from the child's stdout.
+
+        The device count is learned by the caller from a one-shot query (one
+        row per device), never guessed from pipe timing. Rows are returned as
+        raw `bytes`: the output is ASCII, and skipping the UTF-8 decode of the
+        whole buffer lets the numeric fields be cast straight from `bytes`
+        without intermediate `str` objects.
+        """
+        lines = [self.process.stdout.readline() for _ in range(numDevices)]
+        # Drop stale frames buffered while the caller polled slower than the
+        # child's sampling interval, keeping only the most recent one
+        while self._readable(0):
+            fresh = [self.process.stdout.readline() for _ in range(numDevices)]
+            if not all(fresh):
+                break
+            lines = fresh
+        if not all(lines):
+            raise RuntimeError("nvidia-smi stream terminated")
+        # A well-formed frame is exactly the rows with index 0..numDevices-1,
+        # in order; anything else means the device count changed mid-stream
+        # and the caller must respawn rather than serve misaligned rows
+        for g, line in enumerate(lines):
+            if not line.startswith(b"%d, " % g):
+                raise RuntimeError("nvidia-smi stream desynchronized")
+        return [line.rstrip(b"\r\n") for line in lines]
+
+
+def close() -> None:
+    """Terminate the persistent `nvidia-smi` child spawned by `getGPUs`."""
+    _SmiStream.close()
+    _staticByUuid.clear()
+    _prevDynByUuid.clear()
+    _getGpuUuidToIdMap.cache_clear()
+
+
+# uuid -> (memTotal, driver, name, serial, display_active, display_mode,
+# vbios, power_limit, compute_mode, pci_bus), filled on first poll and
+# whenever an unknown uuid shows up
+_staticByUuid = {}
+
+
+# `pci.bus` is a single hex byte (e.g. b"0x01"); a precomputed table lookup
+# replaces the int-parse-with-base call for every value it can ever take
+_HEX_LUT = {b"%02x" % i: i for i in range(256)}
+_HEX_LUT.update({b"%x" % i: i for i in range(256)})
+_HEX_LUT.update({b"0x%02x" % i: i for i in range(256)})
+
+
+def _parsePciBus(val: bytes) -> int:
+    return _HEX_LUT.get(val.strip().lower()) or int(val, 16)
+
+
+def _refreshSmiStatic() -> None:
+    # One-shot query of the fields that cannot change while the driver is
+    # loaded; keeping them out of the per-poll query shortens both the work
+    # done inside nvidia-smi and the CSV parsed on our side
+    p = subprocess.run(
+        [getNvidiaSmiCmd(), _SMI_STATIC_QUERY, "--format=csv,noheader,nounits"],
+        stdout=subprocess.PIPE,
+    )
+    _staticByUuid.clear()
+    if p.returncode != 0:
+        # Leave the cache empty; callers treat that as "no devices"
+        return
+    for line in p.stdout.splitlines():
+        vals = line.split(b", ")
+        _staticByUuid[vals[0].decode("utf8")] = (
+            safeFloatCast(vals[1]),
+            vals[2].decode("utf8"),
+            vals[3].decode("utf8"),
+            vals[4].decode("utf8"),
+            vals[5].decode("utf8"),
+            vals[6].decode("utf8"),
+            vals[7].decode("utf8"),
+            safeFloatCast(vals[8]),
+            vals[9].decode("utf8"),
+            _parsePciBus(vals[10]),
+        )
+
+
+def _getGPUsNvml() -> List[GPU]:
+    # Query all GPUs through in-process NVML calls, skipping the fork+exec and
+    # CSV round-trip of the nvidia-smi subprocess path entirely
+    driver = _nvmlStr(pynvml.nvmlSystemGetDriverVersion())
+    GPUs = []
+    for deviceIds, h in enumerate(_nvmlHandles):
+        memInfo = pynvml.nvmlDeviceGetMemoryInfo(h)
+        # NVML reports bytes; nvidia-smi reports MiB
+        memTotal = memInfo.total / 1048576.0
+        memUsed = memInfo.used / 1048576.0
+        memFree = memInfo.free / 1048576.0
+        util = _nvmlTry(pynvml.nvmlDeviceGetUtilizationRates, h, default=None)
+        gpuUtil = float("nan") if util is None else util.gpu / 100
+        temp_gpu = float(
+            _nvmlTry(pynvml.nvmlDeviceGetTemperature, h, pynvml.NVML_TEMPERATURE_GPU)
+        )
+        core_clock = int(
+            _nvmlTry(pynvml.nvmlDeviceGetClockInfo, h, pynvml.NVML_CLOCK_GRAPHICS, default=0)
+        )
+        memory_clock = int(
+            _nvmlTry(pynvml.nvmlDeviceGetClockInfo, h, pynvml.NVML_CLOCK_MEM, default=0)
+        )
+        power_draw = _nvmlTry(pynvml.nvmlDeviceGetPowerUsage, h) / 1000
+        power_limit = _nvmlTry(pynvml.nvmlDeviceGetEnforcedPowerLimit, h) / 1000
+        display_active = (
+            "Enabled" if _nvmlTry(pynvml.nvmlDeviceGetDisplayActive, h, default=0) else "Disabled"
+        )
+        display_mode = (
+            "Enabled" if _nvmlTry(pynvml.nvmlDeviceGetDisplayMode, h, default=0) else "Disabled"
+        )
+        compute_mode = _NVML_COMPUTE_MODES.get(
+            _nvmlTry(pynvml.nvmlDeviceGetComputeMode, h, default=0), "Default"
+        )
+        GPUs.append(
+            GPU(
+                deviceIds,
+                _nvmlStr(pynvml.nvmlDeviceGetUUID(h)),
+                gpuUtil,
+                memTotal,
+                memUsed,
+                memFree,
+                driver,
+                _nvmlStr(pynvml.nvmlDeviceGetName(h)),
+                _nvmlStr(_nvmlTry(pynvml.nvmlDeviceGetSerial, h, default="[N/A]")),
+                display_mode,
+                display_active,
+                temp_gpu,
+                core_clock,
+                memory_clock,
+                _nvmlStr(_nvmlTry(pynvml.nvmlDeviceGetVBiosVersion, h, default="")),
+                power_draw,
+                power_limit,
+                compute_mode,
+                pynvml.nvmlDeviceGetPciInfo(h).bus,
+            )
+        )
+    return GPUs
+
+
+def getGPUs(interval_ms: int = _SMI_STREAM_INTERVAL_MS) -> List[GPU]:
+    # Get ID, processing and memory utilization for all GPUs
+    if _nvmlHandles is not None:
+        try:
+            return _getGPUsNvml()
+        except:
+            pass
+    try:
+        # The whole fetch runs under the stream lock so concurrent callers
+        # cannot interleave on the shared pipe or race the static cache
+        with _SmiStream._lock:
+            # The static query returns one row per device, so the cache
+            # doubles as the frame-size source for the stream
+            if not _staticByUuid:
+                _refreshSmiStatic()
+            numDevices = len(_staticByUuid)
+            if numDevices == 0:
+                raise RuntimeError("no NVIDIA devices found")
+            lines = _SmiStream.instance(interval_ms).read_frame(numDevices)
+            rows = [line.split(b", ") for line in lines]
+            # Only the string-valued columns are decoded; numeric ones are
+            # cast straight from `bytes`. uuid doubles as the static-cache
+            # join key.
+            uuids = [vals[1].decode("utf8") for vals in rows]
+            # (Re)populate the static cache on the first poll or when the
+            # device set changed (e.g. a GPU was hot-(un)plugged or reset);
+            # if a streamed uuid is still missing afterwards (transient
+            # driver error, empty query output), bail out instead of
+            # KeyError-ing on the join below
+            if any(uuid not in _staticByUuid for uuid in uuids):
+                _refreshSmiStatic()
+                if any(uuid not in _staticByUuid for uuid in uuids):
+                    raise RuntimeError(
+                        "nvidia-smi static query missing streamed device"
+                    )
+            staticRows = [_staticByUuid[uuid] for uuid in uuids]
     except:
+        _SmiStream.close()
+        _staticByUuid.clear()
         return []
-    output = stdout
     ## Parse output
-    # Split on line break
-    lines = output.split(os.linesep)
-    numDevices = len(lines) - 1
     GPUs = []
-    for g in range(numDevices):
-        line = lines[g]
-        # print(line)
-        vals = line.split(", ")
-        # print(vals)
+    for uuid, vals, staticVals in zip(uuids, rows, staticRows):
         deviceIds = int(vals[0])
-        uuid = vals[1]
         gpuUtil = safeFloatCast(vals[2]) / 100
-        memTotal = safeFloatCast(vals[3])
-        memUsed = safeFloatCast(vals[4])
-        memFree = safeFloatCast(vals[5])
-        driver = vals[6]
-        gpu_name = vals[7]
-        serial = vals[8]
-        display_active = vals[9]
-        display_mode = vals[10]
-        temp_gpu = safeFloatCast(vals[11])
-        core_clock = int(vals[12])
-        memory_clock = int(vals[13])
-        vbios_version = vals[14]
-        power_draw = safeFloatCast(vals[15])
-        power_limit = safeFloatCast(vals[16])
-        compute_mode = vals[17]
-        pci_bus = int(vals[18], 16)
+        memUsed = safeFloatCast(vals[3])
+        memFree = safeFloatCast(vals[4])
+        temp_gpu = safeFloatCast(vals[5])
+        core_clock = int(vals[6])
+        memory_clock = int(vals[7])
+        power_draw = safeFloatCast(vals[8])
+        (
+            memTotal,
+            driver,
+            gpu_name,
+            serial,
+            display_active,
+            display_mode,
+            vbios_version,
+            power_limit,
+            compute_mode,
+            pci_bus,
+        ) = staticVals
         GPUs.append(
             GPU(
                 deviceIds,
@@ -231,10 +640,67 @@ def getGPUs() -> List[GPU]:
     return GPUs
 
 
+def _getPidOwners(pids) -> dict:
+    # Resolve uid and uname of all pids with a single `ps` call instead of
+    # one fork+exec per process
+    if not pids:
+        return {}
+    try:
+        p = subprocess.run(
+            ["ps", "-opid=,ruid=,ruser=", "-p", ",".join(map(str, pids))],
+            stdout=subprocess.PIPE,
+            encoding="utf8",
+        )
+        owners = {}
+        for line in p.stdout.splitlines():
+            pidStr, uid, uname = line.split()
+            owners[int(pidStr)] = (int(uid), uname)
+        return owners
+    except:
+        return {}
+
+
+def _getGPUProcessesNvml() -> List[GPUProcess]:
+    entries = []
+    for gpuId, h in enumerate(_nvmlHandles):
+        gpuUuid = _nvmlStr(pynvml.nvmlDeviceGetUUID(h))
+        gpuName = _nvmlStr(pynvml.nvmlDeviceGetName(h))
+        for proc in pynvml.nvmlDeviceGetComputeRunningProcesses(h):
+            processName = _nvmlStr(
+                _nvmlTry(pynvml.nvmlSystemGetProcessName, proc.pid, default="")
+            )
+            # `usedGpuMemory` is in bytes, or None under WDDM/MIG
+            usedMemory = (
+                float("nan")
+                if proc.usedGpuMemory is None
+                else proc.usedGpuMemory / 1048576.0
+            )
+            entries.append((proc.pid, processName, gpuId, gpuUuid, gpuName, usedMemory))
+    owners = _getPidOwners([entry[0] for entry in entries])
+    processes = []
+    for pid, processName, gpuId, gpuUuid, gpuName, usedMemory in entries:
+        uid, uname = owners.get(pid, (-1, ""))
+        processes.append(
+            GPUProcess(pid, processName, gpuId, gpuUuid, gpuName, usedMemory, uid, uname)
+        )
+    return processes
+
+
+@functools.lru_cache(maxsize=1)
+def _getGpuUuidToIdMap() -> dict:
+    # Populated lazily on the first `getGPUProcesses` call rather than at
+    # import time, so merely importing the module never touches the driver
+    return {gpu.uuid: gpu.id for gpu in getGPUs()}
+
+
 def getGPUProcesses() -> List[GPUProcess]:
     """Get all gpu compute processes."""
 
-    global gpuUuidToIdMap
+    if _nvmlHandles is not None:
+        try:
+            return _getGPUProcessesNvml()
+        except:
+            pass
 
     nvidia_smi = getNvidiaSmiCmd()
     try:
@@ -252,13 +718,12 @@ def getGPUProcesses() -> List[GPUProcess]:
         return []
     output = stdout
     ## Parse output
-    # Split on line break
-    lines = output.split(os.linesep)
-    numProcesses = len(lines) - 1
-    processes = []
-    for g in range(numProcesses):
-        line = lines[g]
-        # print(line)
+    # `splitlines` handles \n and \r\n uniformly and, unlike splitting on
+    # os.linesep, yields no trailing empty line to skip by index arithmetic
+    entries = []
+    for line in output.splitlines():
+        if not line:
+            continue
         vals = line.split(", ")
         # print(vals)
         pid = int(vals[0])
@@ -266,22 +731,14 @@ def getGPUProcesses() -> List[GPUProcess]:
         gpuUuid = vals[2]
         gpuName = vals[3]
         usedMemory = safeFloatCast(vals[4])
-        gpuId = gpuUuidToIdMap[gpuUuid]
-        if gpuId is None:
-            gpuId = -1
-
-        # get uid and uname owner of the pid
-        try:
-            p = subprocess.run(
-                ["ps", f"-p{pid}", "-oruid=,ruser="],
-                stdout=subprocess.PIPE,
-                encoding="utf8",
-            )
-            uid, uname = p.stdout.split()
-            uid = int(uid)
-        except:
-            uid, uname = -1, ""
+        gpuId = _getGpuUuidToIdMap().get(gpuUuid, -1)
+        entries.append((pid, processName, gpuId, gpuUuid, gpuName, usedMemory))
 
+    # Resolve all process owners at once
+    owners = _getPidOwners([entry[0] for entry in entries])
+    processes = []
+    for pid, processName, gpuId, gpuUuid, gpuName, usedMemory in entries:
+        uid, uname = owners.get(pid, (-1, ""))
         processes.append(
             GPUProcess(
                 pid, processName, gpuId, gpuUuid, gpuName, usedMemory, uid, uname
@@ -290,6 +747,99 @@ def getGPUProcesses() -> List[GPUProcess]:
     return processes
 
 
+_INF = float("inf")
+_NEG_INF = -_INF
+
+
+# Module-level sort keys for the non-NumPy ordering path: the NaN check is a
+# single `v != v` comparison and the infinities are constants, instead of a
+# per-element lambda constructing `float("inf")` and resolving `math.isnan`
+def _sortKeyId(gpu):
+    v = gpu.id
+    return _INF if v != v else v
+
+
+def _sortKeyIdLast(gpu):
+    v = gpu.id
+    return _NEG_INF if v != v else v
+
+
+def _sortKeyLoad(gpu):
+    v = gpu.load
+    return _INF if v != v else v
+
+
+def _sortKeyMemory(gpu):
+    v = gpu.memoryUtil
+    return _INF if v != v else v
+
+
+# uuid -> tuple of dynamic fields as of the last `getGPUsDelta` call
+_prevDynByUuid = {}
+
+
+def getGPUsDelta(
+    tol: float = 0.0, interval_ms: int = _SMI_STREAM_INTERVAL_MS
+) -> List[GPU]:
+    """Return only the GPUs whose dynamic state changed since the last call.
+
+    Compares load, memory, temperature, clocks and power draw against the
+    previous snapshot (per uuid) and skips GPUs where every delta is within
+    `tol`, so downstream consumers (loggers, exporters) touch only the rows
+    that actually moved. The first call returns all GPUs.
+    """
+    changed = []
+    for gpu in getGPUs(interval_ms):
+        state = (
+            gpu.load,
+            gpu.memoryUsed,
+            gpu.memoryFree,
+            gpu.temperature,
+            gpu.core_clock,
+            gpu.memory_clock,
+            gpu.power_draw,
+        )
+        prev = _prevDynByUuid.get(gpu.uuid)
+        # A field changed if it moved by more than `tol` or if it flipped
+        # between NaN and a number (NaN deltas compare false)
+        if prev is None or any(
+            abs(a - b) > tol or ((a != a) != (b != b)) for a, b in zip(state, prev)
+        ):
+            changed.append(gpu)
+            _prevDynByUuid[gpu.uuid] = state
+    return changed
+
+
+def getGPUsAndProcesses(
+    interval_ms: int = _SMI_STREAM_INTERVAL_MS,
+) -> Tuple[List[GPU], List[GPUProcess]]:
+    """Fetch the GPU list and the compute-process list in one tick.
+
+    On the nvidia-smi path the two fetches are independent (one waits on the
+    streaming child's next frame, the other forks a one-shot query), so they
+    are overlapped instead of run back to back; on the NVML path both are
+    cheap in-process calls and run sequentially.
+    """
+    if _nvmlHandles is not None:
+        try:
+            return _getGPUsNvml(), _getGPUProcessesNvml()
+        except:
+            pass
+
+    async def _gather():
+        return await asyncio.gather(
+            asyncio.to_thread(getGPUs, interval_ms),
+            asyncio.to_thread(getGPUProcesses),
+        )
+
+    try:
+        GPUs, processes = asyncio.run(_gather())
+    except RuntimeError:
+        # Already inside a running event loop: fall back to sequential calls
+        GPUs, processes = getGPUs(interval_ms), getGPUProcesses()
+    return GPUs, processes
+
+
 def getAvailable(
     order="first",
     limit=1,
@@ -331,28 +881,35 @@ def getAvailable(
     GPUs = [GPUs[g] for g in availAbleGPUindex]
 
     # Sort available GPUs according to the order argument
-    if order == "first":
-        GPUs.sort(
-            key=lambda x: float("inf") if math.isnan(x.id) else x.id, reverse=False
-        )
+    if np is not None and GPUs and order in ("first", "last", "load", "memory"):
+        # Vectorized ordering: one NaN-safe argsort over a key array instead
+        # of a Python sort with a per-element lambda
+        keyAttr = {"first": "id", "last": "id", "load": "load", "memory": "memoryUtil"}[
+            order
+        ]
+        keys = np.array([getattr(gpu, keyAttr) for gpu in GPUs], dtype=np.float64)
+        sentinel = -np.inf if order == "last" else np.inf
+        sortedIdx = np.argsort(np.where(np.isnan(keys), sentinel, keys), kind="stable")
+        if order == "last":
+            sortedIdx = sortedIdx[::-1]
+        GPUs = [GPUs[i] for i in sortedIdx]
+    elif order == "first":
+        GPUs.sort(key=_sortKeyId, reverse=False)
     elif order == "last":
-        GPUs.sort(
-            key=lambda x: float("-inf") if math.isnan(x.id) else x.id, reverse=True
-        )
+        GPUs.sort(key=_sortKeyIdLast, reverse=True)
     elif order == "random":
-        GPUs = [GPUs[g] for g in random.sample(range(0, len(GPUs)), len(GPUs))]
+        # Sample only the number of GPUs actually requested instead of
+        # shuffling the whole list and slicing afterwards
+        GPUs = random.sample(GPUs, min(limit, len(GPUs)))
     elif order == "load":
-        GPUs.sort(
-            key=lambda x: float("inf") if math.isnan(x.load) else x.load, reverse=False
-        )
+        GPUs.sort(key=_sortKeyLoad, reverse=False)
     elif order == "memory":
-        GPUs.sort(
-            key=lambda x: float("inf") if math.isnan(x.memoryUtil) else x.memoryUtil,
-            reverse=False,
-        )
+        GPUs.sort(key=_sortKeyMemory, reverse=False)
 
-    # Extract the number of desired GPUs, but limited to the total number of available GPUs
-    GPUs = GPUs[0 : min(limit, len(GPUs))]
+    # Extract the number of desired GPUs, but limited to the total number of
+    # available GPUs ("random" already sampled exactly that many)
+    if order != "random":
+        GPUs = GPUs[0 : min(limit, len(GPUs))]
 
     # Extract the device IDs from the GPUs and return them
     deviceIds = [gpu.id for gpu in GPUs]
@@ -360,6 +917,35 @@ def getAvailable(
     return deviceIds
 
 
+def _availabilityMask(
+    loads,
+    memUtils,
+    memFrees,
+    ids,
+    uuids,
+    computeModes,
+    maxLoad,
+    maxMemory,
+    memoryFree,
+    includeNan,
+    excludeID,
+    excludeUUID,
+    excludeComputeMode,
+):
+    mask = (
+        (memFrees >= memoryFree)
+        & ((loads < maxLoad) | (includeNan & np.isnan(loads)))
+        & ((memUtils < maxMemory) | (includeNan & np.isnan(memUtils)))
+    )
+    if excludeID:
+        mask &= ~np.isin(ids, excludeID)
+    if excludeUUID:
+        mask &= ~np.isin(uuids, excludeUUID)
+    if excludeComputeMode:
+        mask &= ~np.isin(computeModes, excludeComputeMode)
+    return mask
+
+
 def getAvailability(
     GPUs,
     maxLoad=0.5,
@@ -371,6 +957,43 @@ def getAvailability(
     excludeComputeMode=["Exclusive_Process"],
 ) -> List[int]:
     # Determine, which GPUs are available
+    if isinstance(GPUs, GPUTable):
+        # Columnar input: filter straight over the table's arrays
+        mask = _availabilityMask(
+            GPUs.load,
+            GPUs.memoryUtil,
+            GPUs.memoryFree,
+            GPUs.id,
+            GPUs.uuid,
+            GPUs.compute_mode,
+            maxLoad,
+            maxMemory,
+            memoryFree,
+            includeNan,
+            excludeID,
+            excludeUUID,
+            excludeComputeMode,
+        )
+        return mask.astype(int).tolist()
+    if np is not None and GPUs:
+        # Vectorized filter: C-level comparisons over column arrays instead of
+        # six Python-level predicates per GPU
+        mask = _availabilityMask(
+            np.array([gpu.load for gpu in GPUs], dtype=np.float32),
+            np.array([gpu.memoryUtil for gpu in GPUs], dtype=np.float32),
+            np.array([gpu.memoryFree for gpu in GPUs], dtype=np.float32),
+            np.array([gpu.id for gpu in GPUs], dtype=np.int32),
+            np.array([gpu.uuid for gpu in GPUs], dtype=object),
+            np.array([gpu.compute_mode for gpu in GPUs], dtype=object),
+            maxLoad,
+            maxMemory,
+            memoryFree,
+            includeNan,
+            excludeID,
+            excludeUUID,
+            excludeComputeMode,
+        )
+        return mask.astype(int).tolist()
     GPUavailability = [
         1
         if (gpu.memoryFree >= memoryFree)
@@ -441,19 +1064,111 @@ def getFirstAvailable(
     return available
 
 
+# Default column layouts for `showUtilization`, built once at import instead
+# of on every call; the nested lists mark where column-group separators go
+_ATTR_LIST_FULL = [
+    [
+        {"attr": "id", "name": "ID"},
+        {"attr": "name", "name": "Name"},
+        {"attr": "serial", "name": "Serial"},
+        {"attr": "uuid", "name": "UUID"},
+    ],
+    [
+        {
+            "attr": "temperature",
+            "name": "GPU temp.",
+            "suffix": "C",
+            "transform": lambda x: x,
+            "precision": 0,
+        },
+        {
+            "attr": "load",
+            "name": "GPU util.",
+            "suffix": "%",
+            "transform": lambda x: x * 100,
+            "precision": 0,
+        },
+        {
+            "attr": "memoryUtil",
+            "name": "Memory util.",
+            "suffix": "%",
+            "transform": lambda x: x * 100,
+            "precision": 0,
+        },
+    ],
+    [
+        {
+            "attr": "memoryTotal",
+            "name": "Memory total",
+            "suffix": "MB",
+            "precision": 0,
+        },
+        {
+            "attr": "memoryUsed",
+            "name": "Memory used",
+            "suffix": "MB",
+            "precision": 0,
+        },
+        {
+            "attr": "memoryFree",
+            "name": "Memory free",
+            "suffix": "MB",
+            "precision": 0,
+        },
+    ],
+    [
+        {"attr": "display_mode", "name": "Display mode"},
+        {"attr": "display_active", "name": "Display active"},
+    ],
+    [
+        {"attr": "core_clock", "name": "Core Clock"},
+        {"attr": "memory_clock", "name": "Memory Clock"},
+    ],
+    [
+        {"attr": "power_draw", "name": "Power draw"},
+    ],
+    [{"attr": "compute_mode", "name": "Compute mode"}],
+    [{"attr": "pci_bus", "name": "PCI bus ID"}],
+]
+
+_ATTR_LIST_SHORT = [
+    [
+        {"attr": "id", "name": "ID"},
+        {
+            "attr": "load",
+            "name": "GPU",
+            "suffix": "%",
+            "transform": lambda x: x * 100,
+            "precision": 0,
+        },
+        {
+            "attr": "memoryUtil",
+            "name": "MEM",
+            "suffix": "%",
+            "transform": lambda x: x * 100,
+            "precision": 0,
+        },
+    ],
+]
+
+
+# Header and row templates for the `useOldCode` paths, built once at import;
+# `str.format` caches the parsed spec inside the constant string object
+_OLD_ALL_HEADER = " ID | Name | Serial | UUID || GPU util. | Memory util. || Memory total | Memory used | Memory free || Display mode | Display active || Core Clock | Memory Clock || Power draw || Compute Mode || PCI Id"
+_OLD_ALL_ROW_FMT = " {0:2d} | {1:s} | {2:s} | {3:s} || {4:3.0f}% | {5:3.0f}% || {6:.0f}MB | {7:.0f}MB | {8:.0f}MB || {9:s} | {10:s} || {11:d}Mhz | {12:d}Mhz || {13:2.0f}W || {14:s} || {15:X}"
+_OLD_SHORT_HEADER = " ID  GPU  MEM"
+_OLD_SHORT_ROW_FMT = " {0:2d} {1:3.0f}% {2:3.0f}%"
+
+
 def showUtilization(all=False, attrList=None, useOldCode=False):
     GPUs = getGPUs()
     if all:
         if useOldCode:
-            print(
-                " ID | Name | Serial | UUID || GPU util. | Memory util. || Memory total | Memory used | Memory free || Display mode | Display active || Core Clock | Memory Clock || Power draw || Compute Mode || PCI Id"
-            )
-            print(
-                "--------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------"
-            )
+            print(_OLD_ALL_HEADER)
+            print("-" * 212)
             for gpu in GPUs:
                 print(
-                    " {0:2d} | {1:s} | {2:s} | {3:s} || {4:3.0f}% | {5:3.0f}% || {6:.0f}MB | {7:.0f}MB | {8:.0f}MB || {9:s} | {10:s} || {11:d}Mhz | {12:d}Mhz || {13:2.0f}W || {14:s} || {15:X}".format(
+                    _OLD_ALL_ROW_FMT.format(
                         gpu.id,
                         gpu.name,
                         gpu.serial,
@@ -473,205 +1188,84 @@ def showUtilization(all=False, attrList=None, useOldCode=False):
                     )
                 )
         else:
-            attrList = [
-                [
-                    {"attr": "id", "name": "ID"},
-                    {"attr": "name", "name": "Name"},
-                    {"attr": "serial", "name": "Serial"},
-                    {"attr": "uuid", "name": "UUID"},
-                ],
-                [
-                    {
-                        "attr": "temperature",
-                        "name": "GPU temp.",
-                        "suffix": "C",
-                        "transform": lambda x: x,
-                        "precision": 0,
-                    },
-                    {
-                        "attr": "load",
-                        "name": "GPU util.",
-                        "suffix": "%",
-                        "transform": lambda x: x * 100,
-                        "precision": 0,
-                    },
-                    {
-                        "attr": "memoryUtil",
-                        "name": "Memory util.",
-                        "suffix": "%",
-                        "transform": lambda x: x * 100,
-                        "precision": 0,
-                    },
-                ],
-                [
-                    {
-                        "attr": "memoryTotal",
-                        "name": "Memory total",
-                        "suffix": "MB",
-                        "precision": 0,
-                    },
-                    {
-                        "attr": "memoryUsed",
-                        "name": "Memory used",
-                        "suffix": "MB",
-                        "precision": 0,
-                    },
-                    {
-                        "attr": "memoryFree",
-                        "name": "Memory free",
-                        "suffix": "MB",
-                        "precision": 0,
-                    },
-                ],
-                [
-                    {"attr": "display_mode", "name": "Display mode"},
-                    {"attr": "display_active", "name": "Display active"},
-                ],
-                [
-                    {"attr": "core_clock", "name": "Core Clock"},
-                    {"attr": "memory_clock", "name": "Memory Clock"},
-                ],
-                [
-                    {"attr": "power_draw", "name": "Power draw"},
-                ],
-                [{"attr": "compute_mode", "name": "Compute mode"}],
-                [{"attr": "pci_bus", "name": "PCI bus ID"}],
-            ]
+            attrList = _ATTR_LIST_FULL
 
     else:
         if useOldCode:
-            print(" ID  GPU  MEM")
-            print("--------------")
+            print(_OLD_SHORT_HEADER)
+            print("-" * 14)
             for gpu in GPUs:
                 print(
-                    " {0:2d} {1:3.0f}% {2:3.0f}%".format(
+                    _OLD_SHORT_ROW_FMT.format(
                         gpu.id, gpu.load * 100, gpu.memoryUtil * 100
                     )
                 )
         else:
             # if `attrList` was not specified, use the default one
-            attrList = [
-                [
-                    {"attr": "id", "name": "ID"},
-                    {
-                        "attr": "load",
-                        "name": "GPU",
-                        "suffix": "%",
-                        "transform": lambda x: x * 100,
-                        "precision": 0,
-                    },
-                    {
-                        "attr": "memoryUtil",
-                        "name": "MEM",
-                        "suffix": "%",
-                        "transform": lambda x: x * 100,
-                        "precision": 0,
-                    },
-                ],
-            ]
+            attrList = _ATTR_LIST_SHORT
 
     if not useOldCode and attrList is not None:
-        headerString = ""
-        GPUstrings = [""] * len(GPUs)
+        headerParts = []
+        GPUparts = [[] for _ in GPUs]
         for attrGroup in attrList:
-            # print(attrGroup)
             for attrDict in attrGroup:
-                headerString = headerString + "| " + attrDict["name"] + " "
-                headerWidth = len(attrDict["name"])
-                minWidth = len(attrDict["name"])
-
-                attrPrecision = (
-                    "." + str(attrDict["precision"])
-                    if ("precision" in attrDict.keys())
-                    else ""
-                )
+                attrName = attrDict["name"]
                 attrSuffix = (
                     str(attrDict["suffix"]) if ("suffix" in attrDict.keys()) else ""
                 )
-                attrTransform = (
-                    attrDict["transform"]
-                    if ("transform" in attrDict.keys())
-                    else lambda x: x
+                attrTransform = attrDict.get("transform")
+                # One format string compiled per column, not per cell
+                floatFormat = (
+                    "{0:." + str(attrDict["precision"]) + "f}"
+                    if ("precision" in attrDict.keys())
+                    else "{0:f}"
                 )
-                for gpu in GPUs:
-                    attr = getattr(gpu, attrDict["attr"])
 
-                    attr = attrTransform(attr)
-
-                    if isinstance(attr, float):
-                        attrStr = ("{0:" + attrPrecision + "f}").format(attr)
-                    elif isinstance(attr, int):
-                        attrStr = "{0:d}".format(attr)
-                    elif isinstance(attr, str):
-                        attrStr = attr
-                    elif sys.version_info[0] == 2:
-                        if isinstance(attr, str):
-                            attrStr = attr.encode("ascii", "ignore")
-                    else:
-                        raise TypeError(
-                            "Unhandled object type ("
-                            + str(type(attr))
-                            + ") for attribute '"
-                            + attrDict["name"]
-                            + "'"
-                        )
-
-                    attrStr += attrSuffix
-
-                    minWidth = max(minWidth, len(attrStr))
-
-                headerString += " " * max(0, minWidth - headerWidth)
-
-                minWidthStr = str(minWidth - len(attrSuffix))
-
-                for gpuIdx, gpu in enumerate(GPUs):
+                # Single pass over the column: format each cell once,
+                # recording whether it pads left (numbers) or right (text)
+                cells = []
+                for gpu in GPUs:
                     attr = getattr(gpu, attrDict["attr"])
 
-                    attr = attrTransform(attr)
+                    if attrTransform is not None:
+                        attr = attrTransform(attr)
 
                     if isinstance(attr, float):
-                        attrStr = ("{0:" + minWidthStr + attrPrecision + "f}").format(
-                            attr
-                        )
+                        cells.append((floatFormat.format(attr), True))
                     elif isinstance(attr, int):
-                        attrStr = ("{0:" + minWidthStr + "d}").format(attr)
+                        cells.append((str(attr), True))
                     elif isinstance(attr, str):
-                        attrStr = ("{0:" + minWidthStr + "s}").format(attr)
-                    elif sys.version_info[0] == 2:
-                        if isinstance(attr, str):
-                            attrStr = ("{0:" + minWidthStr + "s}").format(
-                                attr.encode("ascii", "ignore")
-                            )
+                        cells.append((attr, False))
                     else:
                         raise TypeError(
                             "Unhandled object type ("
                             + str(type(attr))
                             + ") for attribute '"
-                            + attrDict["name"]
+                            + attrName
                             + "'"
                         )
 
-                    attrStr += attrSuffix
+                minWidth = max(
+                    [len(attrName)] + [len(s) + len(attrSuffix) for s, _ in cells]
+                )
+                valueWidth = minWidth - len(attrSuffix)
 
-                    GPUstrings[gpuIdx] += "| " + attrStr + " "
+                # Second pass is plain padding + join; no `str.format` at all
+                headerParts.append("| " + attrName.ljust(minWidth) + " ")
+                for gpuIdx, (attrStr, padLeft) in enumerate(cells):
+                    attrStr = (
+                        attrStr.rjust(valueWidth)
+                        if padLeft
+                        else attrStr.ljust(valueWidth)
+                    )
+                    GPUparts[gpuIdx].append("| " + attrStr + attrSuffix + " ")
 
-            headerString = headerString + "|"
-            for gpuIdx, gpu in enumerate(GPUs):
-                GPUstrings[gpuIdx] += "|"
+            headerParts.append("|")
+            for parts in GPUparts:
+                parts.append("|")
 
-        headerSpacingString = "-" * len(headerString)
+        headerString = "".join(headerParts)
         print(headerString)
-        print(headerSpacingString)
-        for GPUstring in GPUstrings:
-            print(GPUstring)
-
-
-# Generate gpu uuid to id map
-gpuUuidToIdMap = {}
-try:
-    gpus = getGPUs()
-    for gpu in gpus:
-        gpuUuidToIdMap[gpu.uuid] = gpu.id
-    del gpus
-except:
-    pass
+        print("-" * len(headerString))
+        for parts in GPUparts:
+            print("".join(parts))
@@ -22,10 +22,15 @@
 # Licensed under the MIT License.
 # ──────────────────────────────────────────────────────────────────────────────
 from .GPUtil import __version__
+from .GPUtil import close
 from .GPUtil import getAvailability
 from .GPUtil import getAvailable
 from .GPUtil import getFirstAvailable
 from .GPUtil import getGPUProcesses
 from .GPUtil import getGPUs
+from .GPUtil import getGPUsAndProcesses
+from .GPUtil import getGPUsDelta
+from .GPUtil import getGPUsTable
 from .GPUtil import GPU
+from .GPUtil import GPUTable
 from .GPUtil import showUtilization